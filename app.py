@@ -8,46 +8,76 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime, timedelta
 import sys
 import os
 from pathlib import Path
 import subprocess
 import time
+import json
+import ast
+import io
+import threading
+from collections import deque
+from contextlib import contextmanager
+import hashlib
+import requests
+
+try:
+    import fcntl
+except ImportError:  # Windows 下没有 fcntl，只依靠进程内的线程锁防止同时运行流水线
+    fcntl = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow 为可选依赖，缺失时回退到 pandas 默认解析器和 pickle
+    pa = pa_csv = pq = None
+
+# 价格曲线最多发送到浏览器的点数（超过时降采样）
+PRICE_MAX_POINTS = 2000
 
 # ======================== 数据源配置 ========================
-# 部署版本 - 仅支持从 GitHub 读取数据
-DATA_SOURCE = 'github'
-GITHUB_DATA_URL = 'https://raw.githubusercontent.com/Ray-Yuan21/lundong-data/main'
+# 部署版本默认从 GitHub 读取数据；本地运行可设置 DATA_SOURCE=local 直接读取流水线输出
+DATA_SOURCE = os.environ.get('DATA_SOURCE', 'github')
+GITHUB_DATA_URL = os.environ.get('GITHUB_DATA_URL', 'https://raw.githubusercontent.com/Ray-Yuan21/lundong-data/main')
 
-print(f"[配置] 数据源: GitHub")
+print(f"[配置] 数据源: {DATA_SOURCE}")
 print(f"[配置] 数据 URL: {GITHUB_DATA_URL}")
 # ==========================================================
 
 # 添加路径 - 确保指向 lundong 目录
 # 无论在哪里运行，都确保指向正确的项目根目录
-if Path(__file__).name == 'app.py':
-    # 从 rotation_dashboard/app.py 运行
-    PROJECT_ROOT = Path(__file__).parent.parent.resolve()
-else:
-    # 其他情况，使用当前目录的父目录
-    PROJECT_ROOT = Path.cwd().parent.resolve()
-
-# 确保是 lundong 目录
-if PROJECT_ROOT.name != 'lundong':
-    # 如果不是，向上查找
-    current = Path.cwd()
-    while current.name != 'lundong' and current != current.parent:
-        current = current.parent
-    if current.name == 'lundong':
-        PROJECT_ROOT = current
+@st.cache_resource(show_spinner=False)
+def _project_root():
+    """解析项目根目录（结果在多次重跑之间复用）"""
+    if Path(__file__).name == 'app.py':
+        # 从 rotation_dashboard/app.py 运行
+        root = Path(__file__).parent.parent.resolve()
     else:
-        # 最后的备选方案
-        PROJECT_ROOT = Path('/home/ray/qlib/examples/lundong')
+        # 其他情况，使用当前目录的父目录
+        root = Path.cwd().parent.resolve()
+    
+    # 确保是 lundong 目录
+    if root.name == 'lundong':
+        return root
+    
+    # 如果不是，在当前路径中查找最近的 lundong 目录（只比较路径分量字符串）
+    parts = Path.cwd().parts
+    if 'lundong' in parts:
+        idx = len(parts) - 1 - parts[::-1].index('lundong')
+        return Path(*parts[:idx + 1])
+    
+    # 最后的备选方案
+    return Path('/home/ray/qlib/examples/lundong')
+
 
-sys.path.append(str(PROJECT_ROOT))
+PROJECT_ROOT = _project_root()
+
+# 脚本每次重跑都会执行到这里，避免重复追加
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
 
 # 设置页面配置
 st.set_page_config(
@@ -57,42 +87,371 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# 自定义CSS
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #1f77b4;
-        text-align: center;
-        padding: 1rem 0;
-    }
-    .metric-card {
-        background-color: #f0f2f6;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #1f77b4;
+# 自定义CSS（静态文件，只读取一次）
+STYLE_PATH = Path(__file__).parent / "assets" / "style.css"
+
+
+@st.cache_resource
+def _css():
+    """读取自定义样式表"""
+    return STYLE_PATH.read_text(encoding='utf-8')
+
+
+# ======================== 数据缓存 ========================
+# Streamlit 每次交互都会重跑脚本，读取结果按 (路径, 修改时间) 缓存在进程内
+
+def _mtime(path_or_url):
+    """本地文件返回修改时间（作为缓存键），远程 URL 返回 None"""
+    if str(path_or_url).startswith(('http://', 'https://')):
+        return None
+    try:
+        return os.path.getmtime(path_or_url)
+    except OSError:
+        return None
+
+
+def _columnar_sibling(path_or_url):
+    """本地CSV若存在不旧于它的同名 .feather/.parquet 文件，则优先读取列式文件"""
+    csv_mtime = _mtime(path_or_url)
+    if pq is None or csv_mtime is None:
+        return path_or_url
+    for suffix in ('.feather', '.parquet'):
+        sibling = str(Path(path_or_url).with_suffix(suffix))
+        sibling_mtime = _mtime(sibling)
+        if sibling_mtime is not None and sibling_mtime >= csv_mtime:
+            return sibling
+    return path_or_url
+
+
+# GitHub 文件的 ETag 磁盘缓存：未修改时服务器返回 304，不重复下载正文
+HTTP_CACHE_DIR = Path(__file__).parent / ".streamlit_cache"
+
+
+@st.cache_resource
+def _http_session():
+    """复用 HTTP 连接"""
+    return requests.Session()
+
+
+def _replace_file(path, data):
+    """写入同目录临时文件后 os.replace，读者只会看到完整的旧文件或新文件"""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _github_get(url):
+    """带 If-None-Match 的条件请求；网络不可用或服务器 5xx 时使用上次缓存的内容"""
+    key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    body_path = HTTP_CACHE_DIR / f"{key}.body"
+    etag_path = HTTP_CACHE_DIR / f"{key}.etag"
+    
+    headers = {}
+    if body_path.exists() and etag_path.exists():
+        headers['If-None-Match'] = etag_path.read_text(encoding='utf-8')
+    
+    try:
+        resp = _http_session().get(url, headers=headers, timeout=30)
+    except requests.RequestException:
+        if body_path.exists():
+            print(f"[提示] 网络不可用，使用本地缓存: {url}")
+            return body_path.read_bytes()
+        raise
+    
+    if resp.status_code == 304:
+        return body_path.read_bytes()
+    
+    if resp.status_code >= 500 and body_path.exists():
+        print(f"[提示] GitHub 返回 {resp.status_code}，使用本地缓存: {url}")
+        return body_path.read_bytes()
+    
+    resp.raise_for_status()
+    
+    etag = resp.headers.get('ETag')
+    if etag:
+        try:
+            HTTP_CACHE_DIR.mkdir(exist_ok=True)
+            # 先删 ETag 再替换正文：中途失败或并发读取时最多少一次 304，不会把旧正文配上新 ETag
+            etag_path.unlink(missing_ok=True)
+            _replace_file(body_path, resp.content)
+            _replace_file(etag_path, etag.encode('utf-8'))
+        except OSError as e:
+            print(f"[提示] 写入HTTP缓存失败: {e}")
+    
+    return resp.content
+
+
+def _fetch(path_or_url):
+    """本地文件返回路径，远程 URL 返回下载到的字节"""
+    if str(path_or_url).startswith(('http://', 'https://')):
+        return _github_get(path_or_url)
+    return str(path_or_url)
+
+
+def _as_file(source):
+    """把 _fetch 的结果转换为解析器可读的对象"""
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def _fast_read_csv(path_or_url, parse_dates=None):
+    """优先用 pyarrow 多线程解析CSV（日期列直接解析为时间戳），失败时回退到 pandas"""
+    parse_dates = list(parse_dates or [])
+    source = _fetch(path_or_url)
+    
+    if pa_csv is not None:
+        try:
+            convert_options = pa_csv.ConvertOptions(
+                column_types={col: pa.timestamp('ns') for col in parse_dates},
+                timestamp_parsers=[pa_csv.ISO8601, '%Y-%m-%d']
+            )
+            return pa_csv.read_csv(_as_file(source), convert_options=convert_options).to_pandas()
+        except Exception as e:
+            print(f"[提示] pyarrow 解析失败，回退到 pandas: {e}")
+    
+    # parse_dates 遇到不存在的列会报错，先只读表头确认哪些日期列存在
+    header = pd.read_csv(_as_file(source), nrows=0).columns
+    return pd.read_csv(_as_file(source), parse_dates=[col for col in parse_dates if col in header])
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _read_table_cached(path_or_url, mtime, date_cols=(), index_col=None, sort_by=None):
+    """读取CSV/Parquet并解析日期列，可选按 index_col 建立有序索引或按 sort_by 排序（mtime 仅用于缓存失效）"""
+    print(f"[加载] 读取: {path_or_url}")
+    if str(path_or_url).endswith('.feather'):
+        df = pd.read_feather(path_or_url)
+    elif str(path_or_url).endswith('.parquet'):
+        df = pd.read_parquet(path_or_url)
+    else:
+        df = _fast_read_csv(path_or_url, parse_dates=date_cols)
+    df = _parse_list_columns(_downcast(df))
+    if index_col is not None:
+        df = _index_by(df, index_col)
+    elif sort_by is not None:
+        df = df.sort_values(sort_by, kind='mergesort', ignore_index=True)
+    # 记录数据版本，派生结果（如下载用的CSV、分组）据此缓存：本地文件用修改时间，
+    # 远程文件没有修改时间，用本次加载的时间戳，表缓存刷新后派生缓存随之失效
+    version = mtime if mtime is not None else time.time_ns()
+    df.attrs['cache_key'] = (str(path_or_url), version)
+    return df
+
+
+# 整数列降为 32/16 位；得分和收益率保持 float64，图表标签和下载的CSV需要原始精度
+# 行业和买卖方向取值很少，转为分类类型后比较和分组只处理整数编码
+DOWNCAST_DTYPES = {
+    'symbol': 'category',
+    'action': 'category',
+    'period_number': 'int32',
+    'rank': 'int16',
+}
+
+
+def _downcast(df):
+    """按 DOWNCAST_DTYPES 转换存在的数值列（含缺失值的整数列保持原样）"""
+    dtypes = {
+        col: dtype for col, dtype in DOWNCAST_DTYPES.items()
+        if col in df.columns and not (dtype.startswith('int') and df[col].isna().any())
     }
-    .success-box {
-        background-color: #d4edda;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #28a745;
+    return df.astype(dtypes) if dtypes else df
+
+
+# CSV 中以 "['a', 'b']" 文本保存的列表列
+LIST_COLUMNS = ('positions',)
+
+
+def _parse_list_columns(df):
+    """读取时一次性把列表文本解析为 list（ast.literal_eval 只接受字面量，不执行代码）"""
+    for col in LIST_COLUMNS:
+        if col in df.columns and pd.api.types.is_string_dtype(df[col].dtype):
+            df[col] = df[col].map(lambda x: ast.literal_eval(x) if isinstance(x, str) else x)
+    return df
+
+
+# 轮动得分的索引：按 (日期, 行业) 排序后，按日期切片和按行业取截面都走索引
+SCORES_INDEX = ('date', 'symbol')
+
+
+def _index_by(df, index_col):
+    """设置索引并稳定排序（index_col 为元组时建立多级索引）"""
+    keys = list(index_col) if isinstance(index_col, tuple) else index_col
+    return df.set_index(keys).sort_index(kind='mergesort')
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _to_csv_bytes(key, _df):
+    """生成下载用的CSV字节，按 key（数据来源 + 筛选条件）缓存，_df 不参与哈希"""
+    return _df.to_csv(index=False).encode('utf-8-sig')
+
+
+@st.cache_resource(ttl=600, show_spinner=False)
+def _split_by(key, _df, by):
+    """按列或索引层级 by 拆分为 {取值: 子表}，按数据来源 key 缓存（各会话共享，子表只读）"""
+    level = by if by in _df.index.names else None
+    grouped = _df.groupby(level=level, by=None if level else by, sort=False, observed=True)
+    return {name: group for name, group in grouped}
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _period_stats(key, _df):
+    """周期收益率的汇总统计，按数据来源 key 缓存"""
+    returns = _df['period_return']
+    return {
+        'count': len(_df),
+        'mean': float(returns.mean()),
+        'win_rate': float((returns > 0).mean()) if len(_df) else 0.0,
+        'max': float(returns.max()),
     }
-    .warning-box {
-        background-color: #fff3cd;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #ffc107;
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _signal_stats(key, _df):
+    """买卖信号的汇总统计和行业列表，按数据来源 key 缓存"""
+    action_counts = _df['action'].value_counts()
+    return {
+        'count': len(_df),
+        'buy': int(action_counts.get('BUY', 0)),
+        'sell': int(action_counts.get('SELL', 0)),
+        'symbols': sorted(_df['symbol'].unique()),
     }
-    .error-box {
-        background-color: #f8d7da;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #dc3545;
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _read_status_json_cached(path, mtime):
+    """读取 status.json 边车文件中的 (最新日期, 数据条数)"""
+    with open(path, encoding='utf-8') as f:
+        status = json.load(f)
+    return pd.Timestamp(status['latest_date']), int(status['row_count'])
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _read_parquet_status_cached(path, mtime):
+    """只读 Parquet 文件尾部元数据：行数和日期列的 row group 统计最大值"""
+    pf = pq.ParquetFile(path)
+    metadata = pf.metadata
+    date_idx = pf.schema_arrow.get_field_index('date')
+    
+    stats = [metadata.row_group(i).column(date_idx).statistics for i in range(metadata.num_row_groups)]
+    if stats and all(s is not None and s.has_min_max for s in stats):
+        latest_date = pd.Timestamp(max(s.max for s in stats))
+    else:
+        # 没有统计信息时退而读取最后一个 row group 的日期列（写入时已按日期排序）
+        last_group = pf.read_row_group(metadata.num_row_groups - 1, columns=['date'])
+        latest_date = pd.Timestamp(last_group.column('date').to_pandas().max())
+    
+    return latest_date, metadata.num_rows
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _read_data_status_cached(path, mtime):
+    """读取预处理数据，只返回 (最新日期, 数据条数)，不缓存整张表"""
+    df = pd.read_pickle(path)
+    return _frame_status(df)
+
+
+# 技术因子数据可能的位置（取第一个存在的）；步骤3完成后在旁边写出只含收盘价的宽表
+FACTOR_DATA_PATHS = [
+    PROJECT_ROOT / "layered_factors_v2.pkl",
+    PROJECT_ROOT / "relative_strength" / "layered_factors_v2.pkl"
+]
+PRICE_PANEL_NAME = "prices.parquet"
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _read_price_symbols_cached(path, mtime):
+    """只读 Parquet schema，返回价格宽表中的行业列"""
+    return [name for name in pq.read_schema(path).names if name != 'date']
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _read_price_column_cached(path, mtime, symbol):
+    """只从价格宽表读取一个行业的收盘价列"""
+    return pd.read_parquet(path, columns=[symbol])[symbol]
+
+
+def _symbol_prices(factor_data_path, symbol):
+    """返回 (该行业收盘价或 None, 可用行业)：有不旧于因子数据的 prices.parquet 时只读一列，否则回退到 pickle 宽表"""
+    panel_path = factor_data_path.with_name(PRICE_PANEL_NAME)
+    panel_mtime = _mtime(panel_path)
+    if pq is not None and panel_mtime is not None and panel_mtime >= (_mtime(factor_data_path) or 0):
+        symbols = _read_price_symbols_cached(str(panel_path), panel_mtime)
+        if symbol not in symbols:
+            return None, symbols
+        return _read_price_column_cached(str(panel_path), panel_mtime, symbol), symbols
+    
+    price_lookup = _build_price_lookup(str(factor_data_path), _mtime(factor_data_path))
+    symbols = price_lookup.columns.tolist()
+    if symbol not in price_lookup.columns:
+        return None, symbols
+    return price_lookup[symbol], symbols
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _build_price_lookup(path, mtime):
+    """读取因子数据，只保留收盘价并展开成宽表（日期索引 × 行业列），按行业取价格为 O(1)"""
+    print(f"[加载] 读取: {path}")
+    prices = pd.read_pickle(path)['close'].unstack('symbol')
+    prices.index = pd.to_datetime(prices.index)
+    return prices
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _read_summary_cached(path, mtime):
+    """读取本地 latest_top3.json 摘要，不存在时返回 None（同样缓存，避免反复读取）"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"[提示] 摘要文件不可用，将读取完整轮动得分: {e}")
+        return None
+
+
+def _scores_summary(scores_df):
+    """从轮动得分计算首页/侧边栏所需的摘要（最新日期、统计数和 Top 3）"""
+    # 得分按 (日期, 行业) 索引排序，最新一天直接按索引取出，再做 Top 3 的部分排序
+    dates = scores_df.index.unique(level='date')
+    latest_date = dates[-1]
+    latest_scores = scores_df.loc[[latest_date]].nlargest(3, 'rotation_score').reset_index()
+    
+    return {
+        'latest_date': pd.Timestamp(latest_date).strftime('%Y-%m-%d'),
+        'row_count': int(len(scores_df)),
+        'symbol_count': int(len(scores_df.index.unique(level='symbol'))),
+        'trading_days': int(len(dates)),
+        'top3': [
+            {'symbol': str(row.symbol), 'score': float(row.rotation_score), 'rank': i}
+            for i, row in enumerate(latest_scores.itertuples(index=False), 1)
+        ]
     }
-</style>
-""", unsafe_allow_html=True)
+
+
+def _frame_status(df):
+    """计算预处理数据的 (最新日期, 数据条数)"""
+    # 处理多级索引的情况
+    if isinstance(df.index, pd.MultiIndex):
+        # 获取第一级索引（日期）的最大值
+        latest_date = df.index.get_level_values(0).max()
+    else:
+        latest_date = df.index.max()
+    
+    # 确保是datetime类型
+    if not isinstance(latest_date, pd.Timestamp):
+        latest_date = pd.to_datetime(latest_date)
+    
+    return latest_date, len(df)
+# ==========================================================
+
+
+# 流水线锁：同一进程内的会话用线程锁互斥（同一线程可重入，完整更新中的各步骤不会自锁），
+# 其他进程（如另一个 Dashboard 实例）用 flock 互斥
+PIPELINE_BUSY_MESSAGE = "另一个更新流程正在运行，请稍后再试"
+
+
+@st.cache_resource
+def _pipeline_thread_lock():
+    """进程内唯一的 (线程锁, 线程局部的持有深度)；每次重跑都会重新执行本文件，模块级对象不能跨会话共享"""
+    return threading.RLock(), threading.local()
 
 
 class RotationDashboard:
@@ -100,11 +459,17 @@ class RotationDashboard:
     
     def __init__(self):
         self.data_dir = PROJECT_ROOT / "data"
+        # 每跑完一个流水线脚本加一，页面共享的数据据此判断是否需要重新加载
+        self.data_version = 0
         self.results_dir = PROJECT_ROOT / "relative_strength" / "factor_rotation" / "rotation_results"
         self.backtest_dir = PROJECT_ROOT / "relative_strength" / "factor_rotation" / "backtest_results"
         # 数据文件实际在 relative_strength 目录下
         self.processed_data_path = PROJECT_ROOT / "relative_strength" / "processed_industry_data.pkl"
+        # 预处理完成后写出的列式副本和状态边车文件，供状态查询快速读取
+        self.processed_parquet_path = self.processed_data_path.with_suffix(".parquet")
+        self.status_path = self.processed_data_path.parent / "status.json"
         self.rotation_scores_path = self.results_dir / "rotation_scores.csv"
+        self.latest_top3_path = self.results_dir / "latest_top3.json"
         self.selected_factors_path = self.results_dir / "selected_factors.csv"
         self.backtest_metrics_path = self.results_dir / "backtest_metrics.csv"
         # 增强回测结果路径
@@ -112,74 +477,205 @@ class RotationDashboard:
         self.trade_signals_path = self.backtest_dir / "trade_signals_top3_5d.csv"
         self.enhanced_metrics_path = self.backtest_dir / "backtest_metrics_top3_5d.csv"
         
+    def _source(self, local_path, remote_name):
+        """根据数据源返回本地路径或 GitHub URL"""
+        if DATA_SOURCE == 'local':
+            return str(local_path)
+        return f"{GITHUB_DATA_URL}/{remote_name}"
+    
     def load_data_status(self):
-        """加载数据状态"""
-        if not self.processed_data_path.exists():
+        """加载数据状态（优先读 status.json，其次 Parquet 元数据，最后 pickle）"""
+        pickle_mtime = _mtime(self.processed_data_path)
+        
+        # 边车文件不能比 pickle 旧，否则说明预处理是在 Dashboard 之外重跑的
+        status_mtime = _mtime(self.status_path)
+        if status_mtime is not None and (pickle_mtime is None or status_mtime >= pickle_mtime):
+            try:
+                return _read_status_json_cached(str(self.status_path), status_mtime)
+            except Exception as e:
+                print(f"[提示] 读取 status.json 失败: {e}")
+        
+        parquet_mtime = _mtime(self.processed_parquet_path)
+        if pq is not None and parquet_mtime is not None and (pickle_mtime is None or parquet_mtime >= pickle_mtime):
+            try:
+                return _read_parquet_status_cached(str(self.processed_parquet_path), parquet_mtime)
+            except Exception as e:
+                print(f"[提示] 读取 Parquet 元数据失败: {e}")
+        
+        if pickle_mtime is None:
             return None, None
         
+        return _read_data_status_cached(str(self.processed_data_path), pickle_mtime)
+    
+    def _write_status_sidecar(self):
+        """预处理完成后写出 status.json 和 Parquet 副本，避免状态查询反序列化整张表"""
         df = pd.read_pickle(self.processed_data_path)
-        
-        # 处理多级索引的情况
-        if isinstance(df.index, pd.MultiIndex):
-            # 获取第一级索引（日期）的最大值
-            latest_date = df.index.get_level_values(0).max()
-        else:
-            latest_date = df.index.max()
-        
-        # 确保是datetime类型
-        if not isinstance(latest_date, pd.Timestamp):
-            latest_date = pd.to_datetime(latest_date)
-            
-        data_count = len(df)
-        
-        return latest_date, data_count
+        latest_date, data_count = _frame_status(df)
+        
+        # 先写 status.json：它最小也最常用，不能因为 Parquet 写失败而缺失
+        status = {'latest_date': latest_date.isoformat(), 'row_count': int(data_count)}
+        _replace_file(self.status_path, json.dumps(status).encode('utf-8'))
+        
+        if pq is not None:
+            try:
+                # 按日期排序写出，最后一个 row group 即包含最新日期
+                frame = df.sort_index()
+                if isinstance(frame.index, pd.MultiIndex):
+                    frame.index = frame.index.set_names('date', level=0)
+                else:
+                    frame.index = frame.index.rename('date')
+                frame.to_parquet(self.processed_parquet_path, row_group_size=100_000)
+            except Exception as e:
+                # 写到一半的文件读取元数据时会失败，状态查询仍会回退到 pickle
+                print(f"[提示] 写入 Parquet 副本失败: {e}")
     
     def load_rotation_scores(self):
-        """加载轮动得分"""
+        """加载轮动得分（以 (日期, 行业) 为有序索引）"""
         try:
-            url = f"{GITHUB_DATA_URL}/rotation_scores.csv"
-            print(f"[加载] 从 GitHub 读取: {url}")
-            df = pd.read_csv(url)
-            df['date'] = pd.to_datetime(df['date'])
-            return df
+            src = _columnar_sibling(self._source(self.rotation_scores_path, "rotation_scores.csv"))
+            return _read_table_cached(src, _mtime(src), ('date',), index_col=SCORES_INDEX)
         except Exception as e:
             print(f"[错误] 加载轮动得分失败: {e}")
             return None
     
+    def load_latest_top3(self):
+        """加载最新信号摘要（latest_top3.json），不存在或不可信时返回 None"""
+        # 只用本地摘要：远程文件没有修改时间，无法确认摘要与轮动得分是同一次生成的
+        if DATA_SOURCE != 'local':
+            return None
+        mtime = _mtime(self.latest_top3_path)
+        # 本地摘要比轮动得分旧时说明得分是在 Dashboard 之外重新生成的，不能再用
+        if mtime is None or mtime < (_mtime(self.rotation_scores_path) or 0):
+            return None
+        return _read_summary_cached(str(self.latest_top3_path), mtime)
+    
+    def load_scores_summary(self, load_scores=None):
+        """首页/侧边栏摘要：本地优先读 latest_top3.json，否则由完整轮动得分计算"""
+        summary = self.load_latest_top3()
+        if summary is not None:
+            return summary
+        
+        scores_df = (load_scores or self.load_rotation_scores)()
+        if scores_df is None or len(scores_df) == 0:
+            return None
+        return _scores_summary(scores_df)
+    
+    def _write_latest_top3(self):
+        """生成轮动得分后写出 latest_top3.json，首页无需再读取完整CSV"""
+        scores_df = _index_by(_fast_read_csv(self.rotation_scores_path, parse_dates=['date']), SCORES_INDEX)
+        with open(self.latest_top3_path, 'w', encoding='utf-8') as f:
+            json.dump(_scores_summary(scores_df), f, ensure_ascii=False)
+    
+    def _write_feather_copies(self, *tables):
+        """把流水线输出的CSV另存为 Feather（类型和日期随文件保存，读取时无需重新解析）"""
+        if pq is None:
+            return
+        for csv_path, date_cols in tables:
+            if csv_path.exists():
+                df = _fast_read_csv(csv_path, parse_dates=date_cols)
+                df.to_feather(csv_path.with_suffix('.feather'))
+    
+    def _write_price_panel(self):
+        """因子计算完成后把收盘价另存为 Parquet 宽表（日期 × 行业），按行业只需读取一列"""
+        if pq is None:
+            return
+        for path in FACTOR_DATA_PATHS:
+            if path.exists():
+                prices = pd.read_pickle(path)['close'].unstack('symbol')
+                prices.index = pd.to_datetime(prices.index).rename('date')
+                prices.columns = prices.columns.astype(str)
+                prices.to_parquet(path.with_name(PRICE_PANEL_NAME))
+                return
+    
+    def load_selected_factors(self):
+        """加载选中因子"""
+        try:
+            src = _columnar_sibling(self._source(self.selected_factors_path, "selected_factors.csv"))
+            return _read_table_cached(src, _mtime(src))
+        except Exception as e:
+            print(f"[提示] 选中因子文件不存在: {e}")
+            return None
+    
     def load_period_returns(self):
         """加载周期收益率"""
         try:
-            url = f"{GITHUB_DATA_URL}/backtest_results/period_returns_top3_5d.csv"
-            print(f"[加载] 从 GitHub 读取: {url}")
-            df = pd.read_csv(url)
-            if 'start_date' in df.columns:
-                df['start_date'] = pd.to_datetime(df['start_date'])
-            if 'end_date' in df.columns:
-                df['end_date'] = pd.to_datetime(df['end_date'])
-            return df
+            src = _columnar_sibling(self._source(self.period_returns_path, "backtest_results/period_returns_top3_5d.csv"))
+            return _read_table_cached(src, _mtime(src), ('start_date', 'end_date'))
         except Exception as e:
             print(f"[提示] 周期收益率文件不存在: {e}")
             return None
     
     def load_trade_signals(self):
-        """加载买卖信号"""
+        """加载买卖信号（按日期排序）"""
         try:
-            url = f"{GITHUB_DATA_URL}/backtest_results/trade_signals_top3_5d.csv"
-            print(f"[加载] 从 GitHub 读取: {url}")
-            df = pd.read_csv(url)
-            if 'date' in df.columns:
-                df['date'] = pd.to_datetime(df['date'])
-            return df
+            src = _columnar_sibling(self._source(self.trade_signals_path, "backtest_results/trade_signals_top3_5d.csv"))
+            return _read_table_cached(src, _mtime(src), ('date',), sort_by='date')
         except Exception as e:
             print(f"[提示] 交易信号文件不存在: {e}")
             return None
     
-    def step1_download_data(self):
-        """步骤1: 增量更新ETF数据（智能模式）"""
-        import subprocess
-        import sys
-        import os
+    def _run_script(self, cmd, cwd, timeout, on_line=None):
+        """运行流水线脚本（持有流水线锁），返回 (退出码, 最后几行输出)"""
+        with self._pipeline_lock():
+            return self._stream_script(cmd, cwd, timeout, on_line)
+    
+    def _stream_script(self, cmd, cwd, timeout, on_line=None):
+        """启动脚本并逐行读取输出（不整体缓冲），返回 (退出码, 最后几行输出)"""
+        proc = subprocess.Popen(
+            cmd,
+            cwd=cwd,
+            # 子进程输出到管道时 Python 默认整块缓冲，关闭缓冲后日志才能逐行实时显示
+            env={**os.environ, 'PYTHONUNBUFFERED': '1'},
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=1,
+            text=True
+        )
+        
+        # 子进程长时间无输出时读取会一直阻塞，用定时器到点强制结束
+        timed_out = threading.Event()
+        
+        def _kill():
+            timed_out.set()
+            proc.kill()
         
+        timer = threading.Timer(timeout, _kill)
+        timer.start()
+        tail = deque(maxlen=10)
+        # 界面回调可能抛出异常（如用户点击控件触发 Streamlit 重跑），
+        # 此时不再写日志，但继续读完输出、等脚本正常结束后再抛出，避免管道断开导致脚本中途退出
+        ui_error = None
+        try:
+            for line in proc.stdout:
+                line = line.rstrip()
+                tail.append(line)
+                if on_line is not None and ui_error is None:
+                    try:
+                        on_line(line)
+                    except BaseException as e:
+                        ui_error = e
+            proc.wait()
+        finally:
+            timer.cancel()
+            # 读取输出本身出错时子进程仍在运行，结束并回收它，不留下孤儿进程
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+            # 脚本可能生成了新文件，状态面板的目录缓存和页面共享数据都需要失效
+            _file_map.clear()
+            self.data_version += 1
+        
+        if ui_error is not None:
+            raise ui_error
+        
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        
+        return proc.returncode, "\n".join(tail)
+    
+    def step1_download_data(self, on_line=None):
+        """步骤1: 增量更新ETF数据（智能模式）"""
         try:
             python_exe = sys.executable
             project_root_abs = str(PROJECT_ROOT.resolve())
@@ -188,16 +684,15 @@ class RotationDashboard:
             update_script = os.path.join(data_dir, "update.py")
             
             # 优先使用增量更新脚本
-            result = subprocess.run(
+            returncode, output = self._run_script(
                 [python_exe, update_script],
                 cwd=data_dir,
-                capture_output=True,
-                text=True,
-                timeout=300
+                timeout=300,
+                on_line=on_line
             )
             
-            if result.returncode != 0:
-                return False, f"数据更新失败: {result.stderr[:200]}"
+            if returncode != 0:
+                return False, f"数据更新失败: {output}"
             
             return True, "数据更新成功！"
                 
@@ -206,12 +701,8 @@ class RotationDashboard:
         except Exception as e:
             return False, f"更新异常: {str(e)}"
     
-    def step2_preprocess_data(self):
+    def step2_preprocess_data(self, on_line=None):
         """步骤2: 预处理数据"""
-        import subprocess
-        import sys
-        import os
-        
         try:
             python_exe = sys.executable
             project_root_abs = str(PROJECT_ROOT.resolve())
@@ -219,16 +710,21 @@ class RotationDashboard:
             data_dir = os.path.join(project_root_abs, "data")
             preprocess_script = os.path.join(data_dir, "data_preprocessing.py")
             
-            result = subprocess.run(
+            returncode, output = self._run_script(
                 [python_exe, preprocess_script],
                 cwd=data_dir,
-                capture_output=True,
-                text=True,
-                timeout=300
+                timeout=300,
+                on_line=on_line
             )
             
-            if result.returncode != 0:
-                return False, f"数据预处理失败: {result.stderr[:200]}"
+            if returncode != 0:
+                return False, f"数据预处理失败: {output}"
+            
+            try:
+                self._write_status_sidecar()
+            except Exception as e:
+                # 边车文件只是加速手段，写失败时状态查询会回退到 pickle
+                print(f"[提示] 写入状态边车文件失败: {e}")
             
             return True, "数据预处理完成！"
                 
@@ -237,12 +733,8 @@ class RotationDashboard:
         except Exception as e:
             return False, f"预处理异常: {str(e)}"
     
-    def step3_factor_engineering(self):
+    def step3_factor_engineering(self, on_line=None):
         """步骤3: 计算技术因子"""
-        import subprocess
-        import sys
-        import os
-        
         try:
             python_exe = sys.executable
             project_root_abs = str(PROJECT_ROOT.resolve())
@@ -250,16 +742,21 @@ class RotationDashboard:
             factor_eng_dir = os.path.join(project_root_abs, "relative_strength", "factor_engineering")
             factor_eng_script = os.path.join(factor_eng_dir, "factor_engineering.py")
             
-            result = subprocess.run(
+            returncode, output = self._run_script(
                 [python_exe, factor_eng_script],
                 cwd=factor_eng_dir,
-                capture_output=True,
-                text=True,
-                timeout=600
+                timeout=600,
+                on_line=on_line
             )
             
-            if result.returncode != 0:
-                return False, f"因子工程失败: {result.stderr[:200]}"
+            if returncode != 0:
+                return False, f"因子工程失败: {output}"
+            
+            try:
+                self._write_price_panel()
+            except Exception as e:
+                # 价格宽表只是加速手段，写失败时买卖点图表会回退到 pickle
+                print(f"[提示] 写入价格宽表失败: {e}")
             
             return True, "技术因子计算完成！"
                 
@@ -268,12 +765,8 @@ class RotationDashboard:
         except Exception as e:
             return False, f"因子计算异常: {str(e)}"
     
-    def step4_factor_analysis(self):
+    def step4_factor_analysis(self, on_line=None):
         """步骤4: 分析因子有效性"""
-        import subprocess
-        import sys
-        import os
-        
         try:
             python_exe = sys.executable
             project_root_abs = str(PROJECT_ROOT.resolve())
@@ -281,16 +774,15 @@ class RotationDashboard:
             factor_eng_dir = os.path.join(project_root_abs, "relative_strength", "factor_engineering")
             factor_analysis_script = os.path.join(factor_eng_dir, "factor_analysis_fast.py")
             
-            result = subprocess.run(
+            returncode, output = self._run_script(
                 [python_exe, factor_analysis_script],
                 cwd=factor_eng_dir,
-                capture_output=True,
-                text=True,
-                timeout=600
+                timeout=600,
+                on_line=on_line
             )
             
-            if result.returncode != 0:
-                return False, f"因子分析失败: {result.stderr[:200]}"
+            if returncode != 0:
+                return False, f"因子分析失败: {output}"
             
             return True, "因子分析完成！"
                 
@@ -299,12 +791,8 @@ class RotationDashboard:
         except Exception as e:
             return False, f"因子分析异常: {str(e)}"
     
-    def step5_generate_rotation_scores(self):
+    def step5_generate_rotation_scores(self, on_line=None):
         """步骤5: 生成轮动得分"""
-        import subprocess
-        import sys
-        import os
-        
         try:
             python_exe = sys.executable
             project_root_abs = str(PROJECT_ROOT.resolve())
@@ -312,16 +800,25 @@ class RotationDashboard:
             rotation_dir = os.path.join(project_root_abs, "relative_strength", "factor_rotation")
             rotation_script = os.path.join(rotation_dir, "rotation_strategy.py")
             
-            result = subprocess.run(
+            returncode, output = self._run_script(
                 [python_exe, rotation_script],
                 cwd=rotation_dir,
-                capture_output=True,
-                text=True,
-                timeout=300
+                timeout=300,
+                on_line=on_line
             )
             
-            if result.returncode != 0:
-                return False, f"生成轮动得分失败: {result.stderr[:200]}"
+            if returncode != 0:
+                return False, f"生成轮动得分失败: {output}"
+            
+            try:
+                self._write_latest_top3()
+                self._write_feather_copies(
+                    (self.rotation_scores_path, ['date']),
+                    (self.selected_factors_path, [])
+                )
+            except Exception as e:
+                # 摘要和 Feather 副本只是加速手段，写失败时会回退到完整CSV
+                print(f"[提示] 写入 latest_top3.json / Feather 副本失败: {e}")
             
             return True, "轮动得分生成完成！"
                 
@@ -330,12 +827,8 @@ class RotationDashboard:
         except Exception as e:
             return False, f"轮动得分生成异常: {str(e)}"
     
-    def step6_run_enhanced_backtest(self):
+    def step6_run_enhanced_backtest(self, on_line=None):
         """步骤6: 运行增强回测（计算周期收益和买卖点）"""
-        import subprocess
-        import sys
-        import os
-        
         try:
             python_exe = sys.executable
             project_root_abs = str(PROJECT_ROOT.resolve())
@@ -343,16 +836,23 @@ class RotationDashboard:
             rotation_dir = os.path.join(project_root_abs, "relative_strength", "factor_rotation")
             backtest_script = os.path.join(rotation_dir, "enhanced_backtest.py")
             
-            result = subprocess.run(
+            returncode, output = self._run_script(
                 [python_exe, backtest_script, '--top_n', '3', '--rebalance_period', '5'],
                 cwd=rotation_dir,
-                capture_output=True,
-                text=True,
-                timeout=300
+                timeout=300,
+                on_line=on_line
             )
             
-            if result.returncode != 0:
-                return False, f"增强回测失败: {result.stderr[:200]}"
+            if returncode != 0:
+                return False, f"增强回测失败: {output}"
+            
+            try:
+                self._write_feather_copies(
+                    (self.period_returns_path, ['start_date', 'end_date']),
+                    (self.trade_signals_path, ['date'])
+                )
+            except Exception as e:
+                print(f"[提示] 写入 Feather 副本失败: {e}")
             
             return True, "增强回测完成！"
                 
@@ -362,7 +862,45 @@ class RotationDashboard:
             return False, f"增强回测异常: {str(e)}"
     
     def update_all(self):
-        """一键完整更新（所有步骤）"""
+        """一键完整更新（同一时间只允许一个更新流程运行）"""
+        try:
+            # 整个流程持有锁，其他会话的单步执行不能插在两个步骤之间
+            with self._pipeline_lock():
+                return self._run_update_pipeline()
+        except RuntimeError as e:
+            return False, str(e)
+    
+    @contextmanager
+    def _pipeline_lock(self):
+        """获取流水线锁，已被其他会话或进程持有时抛出 RuntimeError"""
+        thread_lock, held = _pipeline_thread_lock()
+        if not thread_lock.acquire(blocking=False):
+            raise RuntimeError(PIPELINE_BUSY_MESSAGE)
+        
+        lock_file = None
+        depth = getattr(held, 'depth', 0)
+        try:
+            # 只有最外层获取 flock；同一文件重复 flock 会与自己冲突
+            if depth == 0 and fcntl is not None:
+                self.results_dir.mkdir(parents=True, exist_ok=True)
+                lock_file = open(self.results_dir / ".update.lock", "w")
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    raise RuntimeError(PIPELINE_BUSY_MESSAGE)
+            
+            held.depth = depth + 1
+            try:
+                yield
+            finally:
+                held.depth = depth
+        finally:
+            if lock_file is not None:
+                lock_file.close()  # 关闭文件即释放 flock
+            thread_lock.release()
+    
+    def _run_update_pipeline(self):
+        """依次执行所有步骤（每一步都读取上一步的输出，必须顺序执行）"""
         steps = [
             ("🔄 增量更新数据", self.step1_download_data, True),  # 允许失败
             ("🔧 预处理数据", self.step2_preprocess_data, False),
@@ -373,26 +911,117 @@ class RotationDashboard:
         ]
         
         for i, (name, func, allow_fail) in enumerate(steps, 1):
-            st.info(f"[{i}/6] {name}...")
-            success, message = func()
+            # 每个步骤一个状态容器，脚本输出实时写到容器内的日志里
+            status = st.status(f"[{i}/6] {name}...", state="running")
+            try:
+                success, message = func(on_line=_live_log(status))
+            except Exception as e:
+                success, message = False, f"{name}异常: {str(e)}"
             
             if success:
-                st.success(f"✅ {message}")
+                status.update(label=f"✅ [{i}/6] {message}", state="complete")
+            elif allow_fail:
+                status.update(label=f"⚠️ [{i}/6] {message} (将使用现有数据)", state="complete")
             else:
-                if allow_fail:
-                    st.warning(f"⚠️ {message} (将使用现有数据)")
-                else:
-                    st.error(f"❌ {message}")
-                    return False, f"步骤{i}失败: {message}"
+                status.update(label=f"❌ [{i}/6] {message}", state="error")
+                return False, f"步骤{i}失败: {message}"
         
         return True, "全部步骤完成！"
 
 
+@st.cache_data(ttl=5, show_spinner=False)
+def _file_map(directory):
+    """一次 scandir 取得目录下所有文件的修改时间，状态面板不再逐个 stat"""
+    try:
+        with os.scandir(directory) as entries:
+            return {e.name: e.stat().st_mtime for e in entries}
+    except OSError:
+        return {}
+
+
+def _file_exists(path):
+    """通过缓存的目录列表判断文件是否存在"""
+    path = Path(path)
+    return path.name in _file_map(str(path.parent))
+
+
+def _file_mtime(path):
+    """通过缓存的目录列表取得文件修改时间，不存在时返回 None"""
+    path = Path(path)
+    return _file_map(str(path.parent)).get(path.name)
+
+
+def _live_log(container, max_lines=20):
+    """返回逐行输出回调：容器里只保留最近 max_lines 行，避免日志无限增长"""
+    placeholder = container.empty()
+    lines = deque(maxlen=max_lines)
+    
+    def on_line(line):
+        lines.append(line)
+        placeholder.code("\n".join(lines))
+    
+    return on_line
+
+
+# 同一次重跑内多个页面/区块共用的数据，存放在 session_state 中只加载一次
+SHARED_KEYS = ('status', 'scores', 'summary')
+
+
+def _shared(dashboard, key, loader):
+    """本次重跑内只调用一次 loader；执行过流水线步骤后自动重新加载"""
+    entry = st.session_state.get(key)
+    if entry is None or entry[0] != dashboard.data_version:
+        entry = (dashboard.data_version, loader())
+        st.session_state[key] = entry
+    return entry[1]
+
+
+def shared_status(dashboard):
+    """共享的数据状态 (最新日期, 数据条数)"""
+    return _shared(dashboard, 'status', dashboard.load_data_status)
+
+
+def shared_scores(dashboard):
+    """共享的轮动得分"""
+    return _shared(dashboard, 'scores', dashboard.load_rotation_scores)
+
+
+def shared_summary(dashboard):
+    """共享的得分摘要（回退到完整得分时复用 shared_scores）"""
+    return _shared(dashboard, 'summary', lambda: dashboard.load_scores_summary(lambda: shared_scores(dashboard)))
+
+
+@st.cache_resource(show_spinner=False)
+def _figure_resampler():
+    """按需导入 plotly-resampler（可选依赖，缺失时返回 None，价格曲线发送完整数据）"""
+    try:
+        from plotly_resampler import FigureResampler
+    except ImportError:
+        return None
+    return FigureResampler
+
+
+# 片段内的控件变化只重跑该片段（Streamlit >= 1.37 为 st.fragment，1.33 起为 experimental_fragment）
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
+
+@st.cache_resource
+def get_dashboard():
+    """Dashboard 实例在多次重跑之间复用"""
+    return RotationDashboard()
+
+
 def main():
     """主函数"""
     
     # 初始化
-    dashboard = RotationDashboard()
+    dashboard = get_dashboard()
+    
+    # 新的一次完整重跑：丢弃上一次共享的数据，各页面按需加载一次
+    for key in SHARED_KEYS:
+        st.session_state.pop(key, None)
+    
+    st.markdown(f"<style>{_css()}</style>", unsafe_allow_html=True)
     
     # 标题
     st.markdown('<div class="main-header">📊 行业轮动策略 Dashboard</div>', unsafe_allow_html=True)
@@ -410,12 +1039,12 @@ def main():
     
     # 数据状态
     st.sidebar.subheader("📊 数据状态")
-    scores_df = dashboard.load_rotation_scores()
+    summary = shared_summary(dashboard)
     
-    if scores_df is not None and len(scores_df) > 0:
-        # 从轮动得分获取最新日期
-        latest_date = pd.to_datetime(scores_df['date'].max())
-        data_count = len(scores_df)
+    if summary is not None:
+        # 从轮动得分摘要获取最新日期
+        latest_date = pd.Timestamp(summary['latest_date'])
+        data_count = summary['row_count']
         
         st.sidebar.success(f"✅ 数据已加载")
         st.sidebar.info(f"📅 最新日期: {latest_date.strftime('%Y-%m-%d')}")
@@ -454,12 +1083,11 @@ def show_home_page(dashboard):
     # 首先显示数据状态 - 这是最重要的！
     st.subheader("📊 当前数据状态")
     
-    scores_df = dashboard.load_rotation_scores()
+    summary = shared_summary(dashboard)
     
-    if scores_df is not None and len(scores_df) > 0:
-        # 从轮动得分获取最新日期
-        latest_date = pd.to_datetime(scores_df['date'].max())
-        data_count = len(scores_df)
+    if summary is not None:
+        # 从轮动得分摘要获取最新日期
+        latest_date = pd.Timestamp(summary['latest_date'])
         # 数据存在，显示详细状态
         col1, col2, col3, col4 = st.columns(4)
         
@@ -477,13 +1105,11 @@ def show_home_page(dashboard):
         
         with col3:
             # 统计有多少个行业
-            industries_count = scores_df['symbol'].nunique()
-            st.metric("🏢 覆盖行业", f"{industries_count}")
+            st.metric("🏢 覆盖行业", f"{summary['symbol_count']}")
         
         with col4:
             # 统计交易日数量
-            trading_days = scores_df['date'].nunique()
-            st.metric("📊 历史天数", f"{trading_days}")
+            st.metric("📊 历史天数", f"{summary['trading_days']}")
         
         # 数据状态提示
         if days_old == 0:
@@ -505,27 +1131,23 @@ def show_home_page(dashboard):
     # 当前持仓信号
     st.subheader("🎯 当前持仓信号 (Top 3)")
     
-    latest_scores = scores_df[scores_df['date'] == scores_df['date'].max()].copy()
-    latest_scores = latest_scores.sort_values('rotation_score', ascending=False).head(3)
-    
     # 显示信号时间
-    signal_time = pd.to_datetime(scores_df['date'].max())
-    st.caption(f"基于 {signal_time.strftime('%Y年%m月%d日')} 的数据生成")
+    st.caption(f"基于 {latest_date.strftime('%Y年%m月%d日')} 的数据生成")
     
-    for i, (idx, row) in enumerate(latest_scores.iterrows(), 1):
+    for item in summary['top3']:
         col1, col2, col3 = st.columns([3, 2, 1])
         
         with col1:
-            st.markdown(f"### {row['symbol']}")
+            st.markdown(f"### {item['symbol']}")
         
         with col2:
-            score = row['rotation_score']
+            score = item['score']
             color = "green" if score > 0 else "red"
             st.markdown(f"<span style='color:{color}; font-size:1.5rem; font-weight:bold;'>{score:.4f}</span>", 
                        unsafe_allow_html=True)
         
         with col3:
-            st.markdown(f"**排名 #{i}**")
+            st.markdown(f"**排名 #{item['rank']}**")
     
     st.markdown("---")
     
@@ -624,7 +1246,7 @@ def show_update_page(dashboard):
     # 当前数据状态
     st.subheader("📊 当前数据状态")
     
-    latest_date, data_count = dashboard.load_data_status()
+    latest_date, data_count = shared_status(dashboard)
     
     if latest_date:
         col1, col2, col3 = st.columns(3)
@@ -718,7 +1340,7 @@ def show_update_page(dashboard):
             with col1:
                 if st.button("▶️ 执行步骤1", key="step1", use_container_width=True):
                     with st.spinner("正在下载数据..."):
-                        success, message = dashboard.step1_download_data()
+                        success, message = dashboard.step1_download_data(on_line=_live_log(st))
                         if success:
                             st.success(f"✅ {message}")
                         else:
@@ -726,7 +1348,7 @@ def show_update_page(dashboard):
                             st.info("💡 提示: 如果下载失败，可以跳过此步骤，使用现有数据继续")
             with col2:
                 st.caption("状态:")
-                if (dashboard.data_dir / "industry_index_data.pkl").exists():
+                if _file_exists(dashboard.data_dir / "industry_index_data.pkl"):
                     st.success("✓ 已有数据")
                 else:
                     st.warning("✗ 无数据")
@@ -744,14 +1366,14 @@ def show_update_page(dashboard):
             with col1:
                 if st.button("▶️ 执行步骤2", key="step2", use_container_width=True):
                     with st.spinner("正在预处理数据..."):
-                        success, message = dashboard.step2_preprocess_data()
+                        success, message = dashboard.step2_preprocess_data(on_line=_live_log(st))
                         if success:
                             st.success(f"✅ {message}")
                         else:
                             st.error(f"❌ {message}")
             with col2:
                 st.caption("状态:")
-                if dashboard.processed_data_path.exists():
+                if _file_exists(dashboard.processed_data_path):
                     st.success("✓ 已完成")
                 else:
                     st.warning("✗ 未完成")
@@ -770,7 +1392,7 @@ def show_update_page(dashboard):
             with col1:
                 if st.button("▶️ 执行步骤3", key="step3", use_container_width=True):
                     with st.spinner("正在计算因子..."):
-                        success, message = dashboard.step3_factor_engineering()
+                        success, message = dashboard.step3_factor_engineering(on_line=_live_log(st))
                         if success:
                             st.success(f"✅ {message}")
                         else:
@@ -778,7 +1400,7 @@ def show_update_page(dashboard):
             with col2:
                 st.caption("状态:")
                 factor_file = PROJECT_ROOT / "relative_strength" / "factor_engineering" / "factor_data.pkl"
-                if factor_file.exists():
+                if _file_exists(factor_file):
                     st.success("✓ 已完成")
                 else:
                     st.warning("✗ 未完成")
@@ -796,7 +1418,7 @@ def show_update_page(dashboard):
             with col1:
                 if st.button("▶️ 执行步骤4", key="step4", use_container_width=True):
                     with st.spinner("正在分析因子..."):
-                        success, message = dashboard.step4_factor_analysis()
+                        success, message = dashboard.step4_factor_analysis(on_line=_live_log(st))
                         if success:
                             st.success(f"✅ {message}")
                         else:
@@ -804,7 +1426,7 @@ def show_update_page(dashboard):
             with col2:
                 st.caption("状态:")
                 analysis_file = PROJECT_ROOT / "relative_strength" / "factor_engineering" / "factor_analysis_results.pkl"
-                if analysis_file.exists():
+                if _file_exists(analysis_file):
                     st.success("✓ 已完成")
                 else:
                     st.warning("✗ 未完成")
@@ -822,14 +1444,14 @@ def show_update_page(dashboard):
             with col1:
                 if st.button("▶️ 执行步骤5", key="step5", use_container_width=True):
                     with st.spinner("正在生成轮动得分..."):
-                        success, message = dashboard.step5_generate_rotation_scores()
+                        success, message = dashboard.step5_generate_rotation_scores(on_line=_live_log(st))
                         if success:
                             st.success(f"✅ {message}")
                         else:
                             st.error(f"❌ {message}")
             with col2:
                 st.caption("状态:")
-                if dashboard.rotation_scores_path.exists():
+                if _file_exists(dashboard.rotation_scores_path):
                     st.success("✓ 已完成")
                 else:
                     st.warning("✗ 未完成")
@@ -848,7 +1470,7 @@ def show_update_page(dashboard):
             with col1:
                 if st.button("▶️ 执行步骤6", key="step6", use_container_width=True):
                     with st.spinner("正在运行增强回测..."):
-                        success, message = dashboard.step6_run_enhanced_backtest()
+                        success, message = dashboard.step6_run_enhanced_backtest(on_line=_live_log(st))
                         if success:
                             st.success(f"✅ {message}")
                             st.balloons()
@@ -857,7 +1479,7 @@ def show_update_page(dashboard):
                             st.error(f"❌ {message}")
             with col2:
                 st.caption("状态:")
-                if dashboard.period_returns_path.exists():
+                if _file_exists(dashboard.period_returns_path):
                     st.success("✓ 已完成")
                 else:
                     st.warning("✗ 未完成")
@@ -883,7 +1505,7 @@ def show_update_page(dashboard):
                     all_success = True
                     for name, func in steps:
                         st.info(f"执行: {name}...")
-                        success, message = func()
+                        success, message = func(on_line=_live_log(st))
                         if success:
                             st.success(f"✅ {message}")
                         else:
@@ -899,7 +1521,7 @@ def show_update_page(dashboard):
             if st.button("📊 只生成信号（跳过因子计算）", use_container_width=True):
                 """只重新生成轮动得分"""
                 with st.spinner("正在生成轮动得分..."):
-                    success, message = dashboard.step5_generate_rotation_scores()
+                    success, message = dashboard.step5_generate_rotation_scores(on_line=_live_log(st))
                     if success:
                         st.success(f"✅ {message}")
                         st.balloons()
@@ -911,7 +1533,7 @@ def show_update_page(dashboard):
     # 显示更新后的状态
     st.subheader("📋 当前数据状态")
     
-    latest_date_new, data_count_new = dashboard.load_data_status()
+    latest_date_new, data_count_new = shared_status(dashboard)
     
     if latest_date_new:
         col1, col2, col3 = st.columns(3)
@@ -940,15 +1562,15 @@ def show_update_page(dashboard):
     ]
     
     col1, col2, col3 = st.columns(3)
+    now = datetime.now()
     
     for i, (name, path, filename) in enumerate(files_to_check):
         with [col1, col2, col3][i % 3]:
-            if path.exists():
-                # 获取文件修改时间
-                import os
-                mtime = os.path.getmtime(path)
+            # 存在性和修改时间都来自缓存的目录列表
+            mtime = _file_mtime(path)
+            if mtime is not None:
                 mod_date = datetime.fromtimestamp(mtime)
-                days_old = (datetime.now() - mod_date).days
+                days_old = (now - mod_date).days
                 
                 if days_old == 0:
                     status_color = "🟢"
@@ -976,17 +1598,17 @@ def show_update_page(dashboard):
     st.markdown("---")
     st.subheader("📝 更新历史")
     
-    if dashboard.rotation_scores_path.exists():
-        scores_df = dashboard.load_rotation_scores()
-        update_dates = scores_df['date'].unique()
+    if _file_exists(dashboard.rotation_scores_path):
+        scores_df = shared_scores(dashboard)
+        update_dates = scores_df.index.unique(level='date')
         
         st.info(f"总共有 {len(update_dates)} 个交易日的数据")
         
         # 显示最近10次更新
-        recent_dates = sorted(update_dates, reverse=True)[:10]
+        recent_dates = update_dates[::-1][:10]
         
         df_display = pd.DataFrame({
-            '日期': [pd.to_datetime(d).strftime('%Y-%m-%d') for d in recent_dates],
+            '日期': recent_dates.strftime('%Y-%m-%d'),
             '状态': ['✅ 已完成'] * len(recent_dates)
         })
         
@@ -998,24 +1620,38 @@ def show_signal_page(dashboard):
     
     st.header("📈 轮动信号")
     
-    scores_df = dashboard.load_rotation_scores()
+    scores_df = shared_scores(dashboard)
     
     if scores_df is None:
         st.warning("⚠️ 未找到轮动得分数据，请先更新数据")
         return
     
-    # 日期选择
-    available_dates = sorted(scores_df['date'].unique(), reverse=True)
+    show_daily_scores(scores_df)
+
+
+@_fragment
+def show_daily_scores(scores_df):
+    """按日期显示 TOP 3 信号和详细得分"""
+    # plotly 导入较慢，只在绘图页面中导入，不拖慢首页和配置页的冷启动
+    import plotly.graph_objects as go
+    
+    # 日期选择（标签一次性格式化，选项用下标，避免每个选项都重新解析日期）
+    available_dates = scores_df.index.unique(level='date')[::-1]
+    date_labels = available_dates.strftime('%Y-%m-%d').tolist()
     
-    selected_date = st.selectbox(
+    date_pos = st.selectbox(
         "选择日期",
-        available_dates,
-        format_func=lambda x: pd.to_datetime(x).strftime('%Y-%m-%d')
+        range(len(available_dates)),
+        format_func=date_labels.__getitem__
     )
+    selected_date = available_dates[date_pos]
     
-    # 获取当天得分（固定显示 TOP 3）
-    daily_scores = scores_df[scores_df['date'] == selected_date].copy()
-    daily_scores = daily_scores.sort_values('rotation_score', ascending=False)
+    # 获取当天得分（固定显示 TOP 3）：日期是有序索引的第一层，按索引定位而不是逐行比较
+    daily_scores = (
+        scores_df.xs(selected_date, level='date', drop_level=False)
+        .sort_values('rotation_score', ascending=False)
+        .reset_index()
+    )
     
     # TOP 3 信号
     st.subheader("🎯 TOP 3 行业信号")
@@ -1032,16 +1668,18 @@ def show_signal_page(dashboard):
         x=top_scores['symbol'],
         y=top_scores['rotation_score'],
         marker_color=colors,
+        marker_line_width=0,
         text=top_scores['rotation_score'].round(4),
         textposition='outside'
     ))
     
     fig.update_layout(
-        title=f"轮动得分 TOP 3 ({pd.to_datetime(selected_date).strftime('%Y-%m-%d')})",
+        title=f"轮动得分 TOP 3 ({date_labels[date_pos]})",
         xaxis_title="行业",
         yaxis_title="轮动得分",
         height=400,
-        showlegend=False
+        showlegend=False,
+        transition_duration=0
     )
     
     st.plotly_chart(fig, use_container_width=True)
@@ -1049,10 +1687,11 @@ def show_signal_page(dashboard):
     # 详细表格
     st.subheader("📋 详细得分")
     
-    display_df = top_scores[['symbol', 'rotation_score']].copy()
-    display_df['排名'] = range(1, 4)
-    display_df = display_df[['排名', 'symbol', 'rotation_score']]
-    display_df.columns = ['排名', '行业', '轮动得分']
+    display_df = pd.DataFrame({
+        '排名': range(1, len(top_scores) + 1),
+        '行业': top_scores['symbol'],
+        '轮动得分': top_scores['rotation_score']
+    })
     
     st.dataframe(
         display_df,
@@ -1061,11 +1700,11 @@ def show_signal_page(dashboard):
     )
     
     # 下载按钮
-    csv = daily_scores.to_csv(index=False, encoding='utf-8-sig')
+    csv = _to_csv_bytes((scores_df.attrs.get('cache_key'), date_labels[date_pos]), daily_scores)
     st.download_button(
         "📥 下载完整得分",
         csv,
-        f"rotation_scores_{pd.to_datetime(selected_date).strftime('%Y%m%d')}.csv",
+        f"rotation_scores_{date_labels[date_pos].replace('-', '')}.csv",
         "text/csv",
         use_container_width=True
     )
@@ -1076,7 +1715,7 @@ def show_analysis_page(dashboard):
     
     st.header("📊 可视化分析")
     
-    scores_df = dashboard.load_rotation_scores()
+    scores_df = shared_scores(dashboard)
     
     if scores_df is None:
         st.warning("⚠️ 未找到数据，请先更新")
@@ -1097,10 +1736,10 @@ def show_analysis_page(dashboard):
         show_industry_ranking(scores_df)
     
     with tab3:
-        show_period_returns(dashboard)
+        show_period_returns(dashboard.load_period_returns())
     
     with tab4:
-        show_trade_signals(dashboard)
+        show_trade_signals(dashboard.load_trade_signals())
     
     # 高级功能预告
     st.markdown("---")
@@ -1147,13 +1786,15 @@ def show_analysis_page(dashboard):
         """)
 
 
+@_fragment
 def show_score_trend(scores_df):
     """显示得分趋势"""
+    import plotly.graph_objects as go
     
     st.subheader("📈 行业轮动得分趋势")
     
     # 行业选择（单选）
-    industries = sorted(scores_df['symbol'].unique())
+    industries = sorted(scores_df.index.unique(level='symbol'))
     
     selected_industry = st.selectbox(
         "选择行业",
@@ -1162,12 +1803,18 @@ def show_score_trend(scores_df):
     )
     
     # 绘制趋势图
-    industry_data = scores_df[scores_df['symbol'] == selected_industry].sort_values('date')
+    # 按行业预先分组（缓存），选择行业只是字典查找；子表仍按日期有序，长序列用 WebGL 渲染
+    groups = _split_by(scores_df.attrs.get('cache_key'), scores_df, 'symbol')
+    industry_data = groups.get(selected_industry)
+    if industry_data is None:
+        # 分组缓存与得分表版本不一致时直接按索引取截面
+        industry_data = scores_df.xs(selected_industry, level='symbol', drop_level=False)
+    industry_data = industry_data.droplevel('symbol')
     
     fig = go.Figure()
     
-    fig.add_trace(go.Scatter(
-        x=industry_data['date'],
+    fig.add_trace(go.Scattergl(
+        x=industry_data.index,
         y=industry_data['rotation_score'],
         mode='lines+markers',
         name=selected_industry,
@@ -1186,35 +1833,38 @@ def show_score_trend(scores_df):
     st.plotly_chart(fig, use_container_width=True)
 
 
+@_fragment
 def show_industry_ranking(scores_df):
     """显示行业排名变化"""
+    import plotly.graph_objects as go
     
     st.subheader("🏆 行业排名热力图")
     
-    # 计算每日排名
-    ranking_data = []
+    # 只显示最近30天：先按日期索引截取，再计算排名
+    recent_dates = scores_df.index.unique(level='date')[-30:]
+    recent = scores_df.loc[recent_dates[0]:]
     
-    for date in sorted(scores_df['date'].unique()):
-        daily = scores_df[scores_df['date'] == date].sort_values('rotation_score', ascending=False)
-        daily['rank'] = range(1, len(daily) + 1)
-        ranking_data.append(daily[['date', 'symbol', 'rank']])
+    # 一次分组排名计算每日排名（得分越高排名越靠前）
+    ranks = recent.groupby(level='date')['rotation_score'].rank(
+        ascending=False, method='first', na_option='bottom'
+    ).astype('int16')
     
-    ranking_df = pd.concat(ranking_data)
+    # 直接用 NumPy 构建 行业 × 日期 的排名矩阵（代替 pivot），缺失的格子保持为 NaN
+    # float32 缩小传给浏览器的数据量
+    symbols = recent.index.get_level_values('symbol')
+    rows = symbols.unique().sort_values()
+    z = np.full((len(rows), len(recent_dates)), np.nan, dtype='float32')
+    z[rows.get_indexer(symbols), recent_dates.get_indexer(recent.index.get_level_values('date'))] = ranks.to_numpy()
     
-    # 透视表
-    pivot_df = ranking_df.pivot(index='symbol', columns='date', values='rank')
+    # 热力图：只标注前3名，其余排名靠颜色和悬停查看
+    top3_text = np.where(z <= 3, np.char.mod('%d', np.nan_to_num(z)), '')
     
-    # 只显示最近30天
-    recent_cols = sorted(pivot_df.columns, reverse=True)[:30]
-    pivot_df = pivot_df[sorted(recent_cols)]
-    
-    # 热力图
     fig = go.Figure(data=go.Heatmap(
-        z=pivot_df.values,
-        x=[pd.to_datetime(d).strftime('%m-%d') for d in pivot_df.columns],
-        y=pivot_df.index,
+        z=z,
+        x=recent_dates.strftime('%m-%d'),
+        y=rows,
         colorscale='RdYlGn_r',
-        text=pivot_df.values,
+        text=top3_text,
         texttemplate='%{text}',
         textfont={"size": 10},
         colorbar=dict(title="排名")
@@ -1234,6 +1884,7 @@ def show_industry_ranking(scores_df):
 
 def show_factor_analysis(dashboard):
     """显示因子分析"""
+    import plotly.graph_objects as go
     
     st.subheader("📊 选中因子分析")
     
@@ -1302,13 +1953,13 @@ def show_config_page(dashboard):
     """)
 
 
-def show_period_returns(dashboard):
+@_fragment
+def show_period_returns(period_df):
     """显示周期收益率"""
+    import plotly.graph_objects as go
     
     st.subheader("💰 调仓周期收益率分析")
     
-    period_df = dashboard.load_period_returns()
-    
     if period_df is None:
         st.warning("⚠️ 未找到周期收益率数据，请先运行增强回测 (步骤6)")
         st.info("💡 前往「🔄 数据更新」→「步骤6: 运行增强回测」")
@@ -1317,22 +1968,21 @@ def show_period_returns(dashboard):
     # 显示统计信息
     st.markdown("### 📊 周期统计")
     
+    stats = _period_stats(period_df.attrs.get('cache_key'), period_df)
+    
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("总调仓次数", f"{len(period_df)}")
+        st.metric("总调仓次数", f"{stats['count']}")
     
     with col2:
-        avg_return = period_df['period_return'].mean()
-        st.metric("平均周期收益", f"{avg_return:.2%}")
+        st.metric("平均周期收益", f"{stats['mean']:.2%}")
     
     with col3:
-        win_rate = (period_df['period_return'] > 0).sum() / len(period_df)
-        st.metric("周期胜率", f"{win_rate:.2%}")
+        st.metric("周期胜率", f"{stats['win_rate']:.2%}")
     
     with col4:
-        max_return = period_df['period_return'].max()
-        st.metric("最大周期收益", f"{max_return:.2%}")
+        st.metric("最大周期收益", f"{stats['max']:.2%}")
     
     st.markdown("---")
     
@@ -1345,11 +1995,11 @@ def show_period_returns(dashboard):
     colors = ['green' if r > 0 else 'red' for r in period_df['period_return']]
     
     fig.add_trace(go.Bar(
-        x=pd.to_datetime(period_df['start_date']),
+        x=period_df['start_date'],
         y=period_df['period_return'] * 100,  # 转换为百分比
         marker_color=colors,
-        text=[f"{r:.2f}%" for r in period_df['period_return'] * 100],
-        textposition='outside',
+        marker_line_width=0,
+        # 周期可能有数百个，不逐柱标注数值，收益率在悬停提示中查看
         hovertemplate='<b>%{x|%Y-%m-%d}</b><br>' +
                       '收益率: %{y:.2f}%<br>' +
                       '<extra></extra>'
@@ -1361,7 +2011,8 @@ def show_period_returns(dashboard):
         yaxis_title="收益率 (%)",
         height=500,
         showlegend=False,
-        hovermode='closest'
+        hovermode='closest',
+        transition_duration=0
     )
     
     st.plotly_chart(fig, use_container_width=True)
@@ -1372,7 +2023,7 @@ def show_period_returns(dashboard):
     fig2 = go.Figure()
     
     fig2.add_trace(go.Scatter(
-        x=pd.to_datetime(period_df['start_date']),
+        x=period_df['start_date'],
         y=period_df['cumulative_value'],
         mode='lines+markers',
         name='累积净值',
@@ -1400,35 +2051,28 @@ def show_period_returns(dashboard):
     # 显示选项
     show_all = st.checkbox("显示全部周期", value=False)
     
-    display_df = period_df.copy()
-    
-    # 处理列表列显示
-    if 'positions' in display_df.columns:
-        display_df['持仓'] = display_df['positions'].apply(lambda x: ', '.join(eval(x)) if isinstance(x, str) else ', '.join(x))
-    
-    # 选择要显示的列
-    display_df = display_df[[
-        'period_number', 'start_date', 'end_date', 
-        'period_return', 'cumulative_value', '持仓'
-    ]].copy()
-    
-    display_df.columns = ['周期', '开始日期', '结束日期', '周期收益率', '累积净值', '持仓']
-    
-    # 格式化
-    display_df['周期收益率'] = display_df['周期收益率'].apply(lambda x: f"{x:.2%}")
-    display_df['累积净值'] = display_df['累积净值'].apply(lambda x: f"{x:.4f}")
-    display_df['开始日期'] = pd.to_datetime(display_df['开始日期']).dt.strftime('%Y-%m-%d')
-    display_df['结束日期'] = pd.to_datetime(display_df['结束日期']).dt.strftime('%Y-%m-%d')
-    
-    if not show_all:
+    if show_all:
+        shown = period_df
+    else:
         # 只显示最近20个周期
-        display_df = display_df.tail(20)
+        shown = period_df.tail(20)
         st.caption("显示最近20个周期")
     
+    # 只格式化要显示的行，直接生成新的展示表（原表只读，不复制）
+    display_df = pd.DataFrame({
+        '周期': shown['period_number'],
+        '开始日期': shown['start_date'].dt.strftime('%Y-%m-%d'),
+        '结束日期': shown['end_date'].dt.strftime('%Y-%m-%d'),
+        '周期收益率': shown['period_return'].map('{:.2%}'.format),
+        '累积净值': shown['cumulative_value'].map('{:.4f}'.format),
+        # 列表列已在加载时解析
+        '持仓': shown['positions'].str.join(', ')
+    })
+    
     st.dataframe(display_df, use_container_width=True, hide_index=True)
     
     # 下载按钮
-    csv = period_df.to_csv(index=False, encoding='utf-8-sig')
+    csv = _to_csv_bytes(period_df.attrs.get('cache_key'), period_df)
     st.download_button(
         "📥 下载完整周期数据",
         csv,
@@ -1438,13 +2082,13 @@ def show_period_returns(dashboard):
     )
 
 
-def show_trade_signals(dashboard):
+@_fragment
+def show_trade_signals(signals_df):
     """显示买卖点分析"""
+    import plotly.graph_objects as go
     
     st.subheader("🎯 买卖点信号分析")
     
-    signals_df = dashboard.load_trade_signals()
-    
     if signals_df is None:
         st.warning("⚠️ 未找到买卖信号数据，请先运行增强回测 (步骤6)")
         st.info("💡 前往「🔄 数据更新」→「步骤6: 运行增强回测」")
@@ -1453,23 +2097,21 @@ def show_trade_signals(dashboard):
     # 统计信息
     st.markdown("### 📊 信号统计")
     
+    stats = _signal_stats(signals_df.attrs.get('cache_key'), signals_df)
+    
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_signals = len(signals_df)
-        st.metric("总信号数", f"{total_signals}")
+        st.metric("总信号数", f"{stats['count']}")
     
     with col2:
-        buy_signals = (signals_df['action'] == 'BUY').sum()
-        st.metric("买入信号", f"{buy_signals}", delta="🟢")
+        st.metric("买入信号", f"{stats['buy']}", delta="🟢")
     
     with col3:
-        sell_signals = (signals_df['action'] == 'SELL').sum()
-        st.metric("卖出信号", f"{sell_signals}", delta="🔴")
+        st.metric("卖出信号", f"{stats['sell']}", delta="🔴")
     
     with col4:
-        unique_symbols = signals_df['symbol'].nunique()
-        st.metric("涉及行业", f"{unique_symbols}")
+        st.metric("涉及行业", f"{len(stats['symbols'])}")
     
     st.markdown("---")
     
@@ -1477,165 +2119,136 @@ def show_trade_signals(dashboard):
     st.markdown("### 📈 买卖点可视化")
     
     # 选择行业
-    all_symbols = sorted(signals_df['symbol'].unique())
     selected_symbol = st.selectbox(
         "选择行业查看买卖点",
-        all_symbols,
+        stats['symbols'],
         help="选择一个行业查看其历史买卖点"
     )
     
     if selected_symbol:
-        # 筛选该行业的信号
-        symbol_signals = signals_df[signals_df['symbol'] == selected_symbol].copy()
+        # 筛选该行业的信号（按行业预先分组并缓存，子表只读）
+        symbol_signals = _split_by(signals_df.attrs.get('cache_key'), signals_df, 'symbol').get(selected_symbol)
         
-        if len(symbol_signals) == 0:
+        if symbol_signals is None or len(symbol_signals) == 0:
             st.warning(f"未找到 {selected_symbol} 的买卖信号")
             return
         
         st.success(f"✓ 找到 {len(symbol_signals)} 个信号记录")
         
-        # 显示信号表格
+        # 显示信号表格（加载时已按日期升序，倒序即为最新在前）
         st.markdown("#### 📋 买卖信号记录")
         st.dataframe(
-            symbol_signals.sort_values('date', ascending=False),
+            symbol_signals.iloc[::-1],
             use_container_width=True,
             height=400
         )
         
-        # 部署版本只显示买卖信号表格（无价格数据）
-        st.warning("""
-        **📈 完整版功能预告**
-        
-        当前在线版本仅显示买卖信号表格。专业版提供：
-        
-        - 📊 **价格K线图** - 直观查看历史价格走势
-        - 🎯 **买卖点标注** - 在K线图上精确标注每个交易点
-        - 📈 **持仓收益可视化** - 实时跟踪每笔交易的盈亏
-        - 💰 **收益归因分析** - 了解收益来源
-        
-        💼 如需获取完整功能，请联系作者（GitHub: github.com/Ray-Yuan21）
-        """)
-        return
+        if DATA_SOURCE == 'github':
+            # 部署版本只显示买卖信号表格（无价格数据）
+            st.warning("""
+            **📈 完整版功能预告**
+            
+            当前在线版本仅显示买卖信号表格。专业版提供：
+            
+            - 📊 **价格K线图** - 直观查看历史价格走势
+            - 🎯 **买卖点标注** - 在K线图上精确标注每个交易点
+            - 📈 **持仓收益可视化** - 实时跟踪每笔交易的盈亏
+            - 💰 **收益归因分析** - 了解收益来源
+            
+            💼 如需获取完整功能，请联系作者（GitHub: github.com/Ray-Yuan21）
+            """)
+            return
         
         # 尝试加载价格数据（仅本地模式）
         try:
             # 尝试多个可能的路径
-            possible_paths = [
-                PROJECT_ROOT / "layered_factors_v2.pkl",
-                PROJECT_ROOT / "relative_strength" / "layered_factors_v2.pkl"
-            ]
-            
-            factor_data = None
-            factor_data_path = None
+            factor_data_path = next((path for path in FACTOR_DATA_PATHS if _file_exists(path)), None)
             
-            for path in possible_paths:
-                if path.exists():
-                    factor_data_path = path
-                    factor_data = pd.read_pickle(path)
-                    break
-            
-            if factor_data is None:
+            if factor_data_path is None:
                 st.error("❌ 未找到因子数据文件")
                 st.info("💡 请确保已运行完整的数据更新流程")
-                st.code(f"尝试的路径:\n" + "\n".join([str(p) for p in possible_paths]))
+                st.code(f"尝试的路径:\n" + "\n".join([str(p) for p in FACTOR_DATA_PATHS]))
                 return
             
             # 提取该行业的价格数据
-            available_symbols = factor_data.index.get_level_values('symbol').unique().tolist()
-            
-            if selected_symbol not in available_symbols:
+            prices, available_symbols = _symbol_prices(factor_data_path, selected_symbol)
+            if prices is None:
                 st.warning(f"❌ 在因子数据中未找到 {selected_symbol}")
                 st.info(f"💡 可用的行业 ({len(available_symbols)}个):")
                 st.write(available_symbols)
                 return
             
             # 提取价格数据
-            price_data = factor_data.loc[(slice(None), selected_symbol), 'close'].reset_index()
-            price_data.columns = ['date', 'symbol', 'close']
-            price_data['date'] = pd.to_datetime(price_data['date'])
+            prices = prices.dropna()
+            price_data = pd.DataFrame({'date': prices.index, 'close': prices.values})
             
-            # 绘制价格曲线和买卖点
-            fig = go.Figure()
-            
-            # 价格曲线
-            fig.add_trace(go.Scatter(
-                x=price_data['date'],
-                y=price_data['close'],
+            # 价格曲线（点数多，用 WebGL 渲染）
+            price_trace = go.Scattergl(
                 mode='lines',
                 name='价格',
                 line=dict(color='steelblue', width=2),
                 hovertemplate='日期: %{x|%Y-%m-%d}<br>价格: %{y:.2f}<extra></extra>'
-            ))
+            )
+            
+            # 绘制价格曲线和买卖点；历史较长时降采样，只把 PRICE_MAX_POINTS 个点发送到浏览器
+            FigureResampler = _figure_resampler() if len(price_data) > PRICE_MAX_POINTS else None
+            if FigureResampler is not None:
+                # 静态图表不需要 [R] 前缀和聚合粒度后缀，图例保持与未降采样时一致
+                fig = FigureResampler(
+                    go.Figure(),
+                    default_n_shown_samples=PRICE_MAX_POINTS,
+                    resampled_trace_prefix_suffix=('', ''),
+                    show_mean_aggregation_size=False
+                )
+                fig.add_trace(price_trace, hf_x=price_data['date'], hf_y=price_data['close'])
+            else:
+                fig = go.Figure()
+                fig.add_trace(price_trace.update(x=price_data['date'], y=price_data['close']))
+            
+            # 每个信号对应当天价格；当天无价格时取之后最近的价格（一次 merge_asof 完成）
+            # merge_asof 要求两边日期精度一致，不同来源（CSV/Parquet/pickle）可能是 ns 或 us
+            signal_prices = pd.merge_asof(
+                symbol_signals[['date', 'action']].astype({'date': 'datetime64[ns]'}),
+                price_data[['date', 'close']].astype({'date': 'datetime64[ns]'}),
+                on='date',
+                direction='forward'
+            ).dropna(subset=['close'])
+            
+            action_counts = symbol_signals['action'].value_counts()
             
             # 买入点
-            buy_signals = symbol_signals[symbol_signals['action'] == 'BUY'].copy()
-            if len(buy_signals) > 0:
-                buy_prices = []
-                buy_dates = []
-                
-                for _, signal in buy_signals.iterrows():
-                    signal_date = pd.to_datetime(signal['date'])
-                    price_match = price_data[price_data['date'] == signal_date]
-                    
-                    if len(price_match) > 0:
-                        buy_prices.append(price_match.iloc[0]['close'])
-                        buy_dates.append(signal_date)
-                    else:
-                        # 找最近的价格
-                        nearest = price_data[price_data['date'] >= signal_date].head(1)
-                        if len(nearest) > 0:
-                            buy_prices.append(nearest.iloc[0]['close'])
-                            buy_dates.append(signal_date)
-                
-                if len(buy_prices) > 0:
-                    fig.add_trace(go.Scatter(
-                        x=buy_dates,
-                        y=buy_prices,
-                        mode='markers',
-                        name='买入',
-                        marker=dict(
-                            symbol='triangle-up',
-                            size=15,
-                            color='green',
-                            line=dict(color='darkgreen', width=2)
-                        ),
-                        hovertemplate='<b>买入</b><br>日期: %{x|%Y-%m-%d}<br>价格: %{y:.2f}<extra></extra>'
-                    ))
+            buy_points = signal_prices[signal_prices['action'] == 'BUY']
+            if len(buy_points) > 0:
+                fig.add_trace(go.Scatter(
+                    x=buy_points['date'],
+                    y=buy_points['close'],
+                    mode='markers',
+                    name='买入',
+                    marker=dict(
+                        symbol='triangle-up',
+                        size=15,
+                        color='green',
+                        line=dict(color='darkgreen', width=2)
+                    ),
+                    hovertemplate='<b>买入</b><br>日期: %{x|%Y-%m-%d}<br>价格: %{y:.2f}<extra></extra>'
+                ))
             
             # 卖出点
-            sell_signals = symbol_signals[symbol_signals['action'] == 'SELL'].copy()
-            if len(sell_signals) > 0:
-                sell_prices = []
-                sell_dates = []
-                
-                for _, signal in sell_signals.iterrows():
-                    signal_date = pd.to_datetime(signal['date'])
-                    price_match = price_data[price_data['date'] == signal_date]
-                    
-                    if len(price_match) > 0:
-                        sell_prices.append(price_match.iloc[0]['close'])
-                        sell_dates.append(signal_date)
-                    else:
-                        # 找最近的价格
-                        nearest = price_data[price_data['date'] >= signal_date].head(1)
-                        if len(nearest) > 0:
-                            sell_prices.append(nearest.iloc[0]['close'])
-                            sell_dates.append(signal_date)
-                
-                if len(sell_prices) > 0:
-                    fig.add_trace(go.Scatter(
-                        x=sell_dates,
-                        y=sell_prices,
-                        mode='markers',
-                        name='卖出',
-                        marker=dict(
-                            symbol='triangle-down',
-                            size=15,
-                            color='red',
-                            line=dict(color='darkred', width=2)
-                        ),
-                        hovertemplate='<b>卖出</b><br>日期: %{x|%Y-%m-%d}<br>价格: %{y:.2f}<extra></extra>'
-                    ))
+            sell_points = signal_prices[signal_prices['action'] == 'SELL']
+            if len(sell_points) > 0:
+                fig.add_trace(go.Scatter(
+                    x=sell_points['date'],
+                    y=sell_points['close'],
+                    mode='markers',
+                    name='卖出',
+                    marker=dict(
+                        symbol='triangle-down',
+                        size=15,
+                        color='red',
+                        line=dict(color='darkred', width=2)
+                    ),
+                    hovertemplate='<b>卖出</b><br>日期: %{x|%Y-%m-%d}<br>价格: %{y:.2f}<extra></extra>'
+                ))
             
             fig.update_layout(
                 title=f"{selected_symbol} - 价格与买卖点",
@@ -1657,9 +2270,9 @@ def show_trade_signals(dashboard):
             # 显示统计信息
             col1, col2 = st.columns(2)
             with col1:
-                st.metric("买入次数", len(buy_signals))
+                st.metric("买入次数", int(action_counts.get('BUY', 0)))
             with col2:
-                st.metric("卖出次数", len(sell_signals))
+                st.metric("卖出次数", int(action_counts.get('SELL', 0)))
             
         except Exception as e:
             import traceback
@@ -1684,38 +2297,34 @@ def show_trade_signals(dashboard):
     with col2:
         show_recent = st.slider("显示最近N个信号", 10, 100, 50)
     
-    # 应用筛选
-    filtered_signals = signals_df.copy()
-    
-    if action_filter == "买入":
-        filtered_signals = filtered_signals[filtered_signals['action'] == 'BUY']
-    elif action_filter == "卖出":
-        filtered_signals = filtered_signals[filtered_signals['action'] == 'SELL']
+    # 应用筛选（按买卖方向预先分组并缓存，筛选只是字典查找）
+    filtered_signals = signals_df
     
-    # 按日期降序排列
-    filtered_signals = filtered_signals.sort_values('date', ascending=False).head(show_recent)
+    if action_filter in ("买入", "卖出"):
+        by_action = _split_by(signals_df.attrs.get('cache_key'), signals_df, 'action')
+        filtered_signals = by_action.get('BUY' if action_filter == "买入" else 'SELL', signals_df.iloc[:0])
     
-    # 格式化显示
-    display_signals = filtered_signals.copy()
-    display_signals['日期'] = display_signals['date'].dt.strftime('%Y-%m-%d')
-    display_signals['行业'] = display_signals['symbol']
-    display_signals['操作'] = display_signals['action'].apply(lambda x: '🟢 买入' if x == 'BUY' else '🔴 卖出')
-    display_signals['原因'] = display_signals['reason']
+    # 按日期降序排列（加载时已按日期升序）
+    filtered_signals = filtered_signals.iloc[::-1].head(show_recent)
     
-    # 选择要显示的列
-    display_cols = ['日期', '行业', '操作', '原因']
-    if 'score' in display_signals.columns:
-        display_signals['得分'] = display_signals['score'].apply(lambda x: f"{x:.4f}" if pd.notna(x) else "-")
-        display_cols.append('得分')
+    # 格式化显示（直接生成新的展示表，筛选结果只读，不复制）
+    display_signals = pd.DataFrame({
+        '日期': filtered_signals['date'].dt.strftime('%Y-%m-%d'),
+        '行业': filtered_signals['symbol'],
+        '操作': np.where(filtered_signals['action'] == 'BUY', '🟢 买入', '🔴 卖出'),
+        '原因': filtered_signals['reason']
+    })
+    if 'score' in filtered_signals.columns:
+        display_signals['得分'] = filtered_signals['score'].map(lambda x: f"{x:.4f}" if pd.notna(x) else "-")
     
     st.dataframe(
-        display_signals[display_cols],
+        display_signals,
         use_container_width=True,
         hide_index=True
     )
     
     # 下载按钮
-    csv = signals_df.to_csv(index=False, encoding='utf-8-sig')
+    csv = _to_csv_bytes(signals_df.attrs.get('cache_key'), signals_df)
     st.download_button(
         "📥 下载完整信号数据",
         csv,